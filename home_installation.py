@@ -1,112 +1,384 @@
 import cv2
+import numpy as np
 import pygame
 import time
+import math
 import os
 import subprocess
 import signal
 import threading
+import queue
+import json
+import uuid
+import argparse
+import re
+import struct
+import bisect
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Constants
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
+PREVIEW_WIDTH = 640  # Camera preview is captured at half size and scaled up
+PREVIEW_HEIGHT = 360
 RECORD_SECONDS = 30
 PREP_SECONDS = 5
 FONT_SIZE = 36
 FONT_COLOR = (255, 255, 255)
 BACKGROUND_COLOR = (0, 0, 0)
+RECORDING_COLOR = (255, 0, 0)
+PROMPT_MESSAGE = "What does home mean to you?"
+THANK_YOU_MESSAGE = "Thank you for sharing your story!"
+IDLE_MESSAGE = "Press SPACE to record your story about home"
+PLAYBACK_HINT = "Playing recordings - Press SPACE to record new"
+RECORDING_INDICATOR = "● REC"
 VIDEO_FOLDER = "recordings"
-TEMP_AUDIO_PLAYBACK = "temp_audio_playback.wav"
+AUDIO_SAMPLE_RATE = 44100
+MAX_CATCHUP_FRAMES = 30  # Beyond this many late frames, seek instead of grabbing
+CAPTURE_CACHE_SIZE = 3  # Recently played captures kept open for reuse
+MIN_VIDEO_FILE_SIZE = 1000  # Smaller .mp4 files are failed recordings
+MAX_EVENT_WAIT = 0.05  # Longest idle wait, in seconds, before checking input
+IDLE_RESCAN_MS = 1000  # How often the empty idle screen looks for new videos
+DECODE_QUEUE_SIZE = 4  # Playback frames decoded ahead of display
+DECODE_TIMEOUT = 2  # Seconds to wait for a decoded frame before giving up
+STALL_JOIN_TIMEOUT = 0.5  # Seconds to wait for a stalled decoder to exit
+HW_VIDEO_ENCODER_ARGS = ["-c:v", "h264_videotoolbox", "-b:v", "6M", "-realtime", "1"]
+SW_VIDEO_ENCODER_ARGS = ["-c:v", "libx264", "-preset", "fast", "-crf", "23"]  # Better quality than ultrafast
+PROBE_CACHE_FILE = os.path.expanduser("~/.cache/home_installation/devices.json")
+PROBE_CACHE_TTL = 24 * 60 * 60  # Re-probe ffmpeg and devices once a day
+PROBE_CACHE_VERSION = 2
+AUDIO_CACHE_DIR = os.path.expanduser("~/.cache/home_installation/audio")  # Extracted WAVs
+AVFOUNDATION_DEVICE_RE = re.compile(
+    r"\[AVFoundation [^\]]*\]\s*(?:AVFoundation (audio|video) devices:|\[(\d+)\]\s*(.+))")
 
 # Setup
 os.makedirs(VIDEO_FOLDER, exist_ok=True)
+os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
 pygame.init()
-pygame.mixer.init()
+pygame.mixer.init(frequency=AUDIO_SAMPLE_RATE)
 screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 pygame.display.set_caption("Home Installation")
 font = pygame.font.SysFont("Arial", FONT_SIZE)
-clock = pygame.time.Clock()
+video_encoder_args = SW_VIDEO_ENCODER_ARGS
+recorded_videos = []  # Playable recordings in name order; kept up to date as we record
+recorded_videos_signature = None  # .mp4 name -> (size, mtime) when recorded_videos was last scanned
+audio_tracks = {}  # Video path -> Future of its WAV path (None if it has no audio)
+audio_pool = ThreadPoolExecutor(max_workers=2)
+audio_extractions = {}  # Video path -> running ffmpeg audio extraction
+video_fps_cache = {}  # Video path -> frame rate
+capture_cache = OrderedDict()  # Video path -> rewound cv2.VideoCapture, oldest first
+pending_captures = {}  # Video path -> Future of a cv2.VideoCapture being opened
+capture_opener = ThreadPoolExecutor(max_workers=1)
+scan_pool = ThreadPoolExecutor(max_workers=os.cpu_count())  # Recording validation
+cv2.setNumThreads(max(1, (os.cpu_count() or 1) - 1))  # Leave a core for the UI loop
+use_opencl = cv2.ocl.haveOpenCL()  # Run frame conversion on the GPU via cv2.UMat
+cv2.ocl.setUseOpenCL(use_opencl)
+text_cache = {}  # (text, color) -> rendered Surface
+frame_surfaces = {}  # (width, height, pixel format) -> (buffer, Surface sharing it)
+pygame_reads_bgr = pygame.version.vernum >= (2, 1, 3)  # frombuffer "BGR" support
+bgr_fallback_surfaces = {}  # (width, height) -> 24-bit Surface for older pygame
+bgr_to_rgb_transposed = None  # Old-pygame frame conversion, set up by prepare_bgr_fallback()
+scaled_frame_surface = None  # Window-sized Surface matching the preview frames' format
+
+def render_text(text, color=FONT_COLOR):
+    """Render text with the UI font, reusing the Surface for repeated strings
+
+    Cached Surfaces are converted to the display's pixel format, so drawing
+    them over video frames needs no per-blit format conversion.
+    """
+    key = (text, color)
+    surf = text_cache.get(key)
+    if surf is None:
+        surf = text_cache[key] = font.render(text, True, color).convert_alpha()
+    return surf
 
 def display_message(message, duration, countdown=False):
     """Display a message on screen with optional countdown"""
-    end_time = time.time() + duration
-    while time.time() < end_time:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return True
-        
-        screen.fill(BACKGROUND_COLOR)
-        text = font.render(message, True, FONT_COLOR)
-        rect = text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 20))
-        screen.blit(text, rect)
+    # The message is static: draw the whole screen once, then only ever
+    # update the countdown's rectangle
+    text = render_text(message)
+    rect = text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 20))
+    screen.fill(BACKGROUND_COLOR)
+    screen.blit(text, rect)
+    pygame.display.flip()
+
+    timer_rect = None
+    shown_remaining = None
+    # Monotonic time is immune to wall-clock adjustments mid-countdown
+    end_time = time.monotonic() + duration
+    while True:
+        now = time.monotonic()  # Read the clock once per wake-up
+        if now >= end_time:
+            break
 
         if countdown:
-            remaining = int(end_time - time.time()) + 1  # +1 to show countdown properly
-            if remaining > 0:
-                timer_text = font.render(str(remaining), True, FONT_COLOR)
-                timer_rect = timer_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 40))
-                screen.blit(timer_text, timer_rect)
-
-        pygame.display.flip()
-        clock.tick(30)
+            remaining = int(end_time - now) + 1  # +1 to show countdown properly
+            if remaining > 0 and remaining != shown_remaining:
+                shown_remaining = remaining
+                timer_text = render_text(str(remaining))
+                new_rect = timer_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 40))
+                dirty_rect = new_rect if timer_rect is None else new_rect.union(timer_rect)
+                screen.fill(BACKGROUND_COLOR, dirty_rect)
+                screen.blit(timer_text, new_rect)
+                pygame.display.update(dirty_rect)
+                timer_rect = new_rect
+
+        # Nothing changes until the countdown's next second (or the end), so
+        # sleep until then, waking early only for input
+        wait_seconds = (end_time - now) % 1 if countdown else end_time - now
+        event = pygame.event.wait(max(1, math.ceil(wait_seconds * 1000)))
+        if event.type == pygame.QUIT:
+            return True
     return False
 
-def test_camera_and_audio():
-    """Test if camera and audio devices are available"""
-    print("Testing camera...")
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("ERROR: Cannot access camera!")
-        return False
-    cap.release()
-    print("Camera OK")
-    
+def detect_video_encoder():
+    """Use the VideoToolbox hardware H.264 encoder if ffmpeg has it"""
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                          capture_output=True, text=True)
+    if "h264_videotoolbox" in result.stdout:
+        return HW_VIDEO_ENCODER_ARGS
+    return SW_VIDEO_ENCODER_ARGS
+
+def probe_ffmpeg():
+    """Check ffmpeg and collect encoder and device info, or None on failure"""
     # Test ffmpeg availability
     try:
         result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True)
         if result.returncode != 0:
             print("ERROR: ffmpeg not found!")
-            return False
+            return None
         print("ffmpeg OK")
+        probe = {"video_encoder_args": detect_video_encoder(), "devices": ""}
     except FileNotFoundError:
         print("ERROR: ffmpeg not installed!")
-        return False
+        return None
     
-    # List available devices (macOS)
+    probe["devices"] = list_avfoundation_devices()
+    return probe
+
+def list_avfoundation_devices():
+    """List AVFoundation capture devices (macOS) as {"video": [...], "audio": [...]}"""
+    devices = {"video": [], "audio": []}
     try:
         result = subprocess.run(["ffmpeg", "-f", "avfoundation", "-list_devices", "true", "-i", ""], 
-                              capture_output=True, text=True)
-        print("Available devices:")
-        print(result.stderr)  # ffmpeg outputs device list to stderr
+                              capture_output=True, text=True, timeout=10)
     except Exception as e:
         print(f"Could not list devices: {e}")
+        return devices
+
+    # ffmpeg outputs the device list to stderr
+    section = None
+    for match in AVFOUNDATION_DEVICE_RE.finditer(result.stderr):
+        if match.group(1):
+            section = match.group(1)
+        elif section:
+            devices[section].append([int(match.group(2)), match.group(3)])
+    return devices
+
+def load_probe_cache():
+    """Return cached probe results if they are fresh and from this machine"""
+    try:
+        with open(PROBE_CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("version") != PROBE_CACHE_VERSION or cache.get("machine") != uuid.getnode():
+        return None
+    if time.time() - cache.get("time", 0) > PROBE_CACHE_TTL:
+        return None
+    return cache.get("probe")
+
+def save_probe_cache(probe):
+    """Persist probe results so the next start can skip probing"""
+    try:
+        os.makedirs(os.path.dirname(PROBE_CACHE_FILE), exist_ok=True)
+        with open(PROBE_CACHE_FILE, "w") as f:
+            json.dump({"version": PROBE_CACHE_VERSION, "machine": uuid.getnode(), "time": time.time(), "probe": probe}, f)
+    except OSError as e:
+        print(f"Could not write probe cache: {e}")
+
+def test_camera_and_audio(reprobe=False):
+    """Test if camera and audio devices are available"""
+    global video_encoder_args
+    print("Testing camera...")
+    cap = cv2.VideoCapture(0)
+    if not cap.isOpened():
+        print("ERROR: Cannot access camera!")
+        return False
+    cap.release()
+    print("Camera OK")
+    
+    probe = None if reprobe else load_probe_cache()
+    if probe is None:
+        probe = probe_ffmpeg()
+        if probe is None:
+            return False
+        save_probe_cache(probe)
+    else:
+        print("Using cached ffmpeg probe (run with --reprobe to refresh)")
+
+    video_encoder_args = probe["video_encoder_args"]
+    print(f"Video encoder: {video_encoder_args[1]}")
+    print("Available devices:")
+    for kind in ("video", "audio"):
+        for index, name in probe["devices"][kind]:
+            print(f"  {kind} [{index}] {name}")
     
     return True
 
+def get_frame_surface(width, height, pixel_format):
+    """Return a reusable frame buffer and a persistent Surface sharing its pixels
+
+    Writing a frame into the buffer updates the Surface in place, so frames
+    can be drawn without allocating a new Surface each time.
+    """
+    key = (width, height, pixel_format)
+    if key not in frame_surfaces:
+        buf = np.empty((height, width, 3), dtype=np.uint8)
+        frame_surfaces[key] = (buf, pygame.image.frombuffer(buf, (width, height), pixel_format))
+    return frame_surfaces[key]
+
+def prepare_bgr_fallback():
+    """Set up the frame conversion used when pygame cannot read BGR
+
+    Numba is optional and only imported for older pygame. Its kernel is
+    compiled here, on a dummy frame, so playback never stalls on it.
+    """
+    global bgr_to_rgb_transposed
+    try:
+        from numba import njit, prange  # Optional: speeds up the old-pygame frame path
+    except ImportError:
+        def bgr_to_rgb_transposed(src, dst):
+            """Write a (height, width) BGR frame into a (width, height) RGB array"""
+            dst[:] = src[:, :, ::-1].swapaxes(0, 1)
+    else:
+        @njit(parallel=True, cache=True)
+        def bgr_to_rgb_transposed(src, dst):
+            """Write a (height, width) BGR frame into a (width, height) RGB array"""
+            # One fused pass, rows split across cores, instead of NumPy's
+            # strided channel-reverse plus transpose
+            for y in prange(src.shape[0]):
+                for x in range(src.shape[1]):
+                    dst[x, y, 0] = src[y, x, 2]
+                    dst[x, y, 1] = src[y, x, 1]
+                    dst[x, y, 2] = src[y, x, 0]
+    bgr_to_rgb_transposed(np.zeros((2, 2, 3), dtype=np.uint8), np.empty((2, 2, 3), dtype=np.uint8))
+
+def bgr_surface(frame):
+    """Return a Surface showing an OpenCV BGR frame
+
+    pygame 2.1.3+ wraps the frame's pixels directly. Older versions cannot
+    read BGR, so the frame is copied into a persistent 24-bit Surface through
+    a pixels3d view instead of building a new Surface with make_surface.
+    """
+    height, width = frame.shape[:2]
+    if pygame_reads_bgr:
+        # frombuffer reads the row-major array directly - no transposed copy
+        return pygame.image.frombuffer(frame, (width, height), "BGR")
+
+    surf = bgr_fallback_surfaces.get((width, height))
+    if surf is None:
+        surf = bgr_fallback_surfaces[(width, height)] = pygame.Surface((width, height), 0, 24)
+    pixels = pygame.surfarray.pixels3d(surf)
+    bgr_to_rgb_transposed(frame, pixels)
+    del pixels  # Releases the Surface lock
+    return surf
+
+def frame_to_surface(frame):
+    """Wrap an OpenCV BGR frame as a window-sized pygame Surface
+
+    No color conversion pass is made. Frames that need resizing are drawn
+    through a reused Surface, so blit the result before the next call.
+    """
+    if frame.shape[:2] != (WINDOW_HEIGHT, WINDOW_WIDTH):
+        if use_opencl:
+            frame = cv2.resize(cv2.UMat(frame), (WINDOW_WIDTH, WINDOW_HEIGHT)).get()
+        elif pygame_reads_bgr:
+            buf, surf = get_frame_surface(WINDOW_WIDTH, WINDOW_HEIGHT, "BGR")
+            cv2.resize(frame, (WINDOW_WIDTH, WINDOW_HEIGHT), dst=buf)
+            return surf
+        else:
+            frame = cv2.resize(frame, (WINDOW_WIDTH, WINDOW_HEIGHT))
+    return bgr_surface(frame)
+
+def blit_scaled_frame(frame):
+    """Draw an OpenCV BGR frame of any size scaled to fill the window"""
+    global scaled_frame_surface
+    surf = bgr_surface(frame)
+    if surf.get_size() != (WINDOW_WIDTH, WINDOW_HEIGHT):
+        # transform.scale needs a destination in the source's pixel format,
+        # which the display surface is not, so scale into a reused Surface
+        if (scaled_frame_surface is None or scaled_frame_surface.get_bitsize() != surf.get_bitsize()
+                or scaled_frame_surface.get_masks() != surf.get_masks()):
+            scaled_frame_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), 0, surf)
+        pygame.transform.scale(surf, (WINDOW_WIDTH, WINDOW_HEIGHT), scaled_frame_surface)
+        surf = scaled_frame_surface
+    screen.blit(surf, (0, 0))
+
+def read_preview_frames(stream, latest, lock, frame_ready, feed_ended):
+    """Read raw BGR preview frames from ffmpeg's stdout, keeping only the newest
+
+    Reads until EOF even after the preview stops being shown, so ffmpeg never
+    blocks on a full pipe while it finishes writing the recording.
+    """
+    # Two reused buffers: one being filled, one published as the latest frame.
+    # The UI only touches the published one while holding the lock.
+    buffers = [np.empty((PREVIEW_HEIGHT, PREVIEW_WIDTH, 3), dtype=np.uint8) for _ in range(2)]
+    count = 0
+    while True:
+        frame = buffers[count % 2]
+        view = memoryview(frame).cast("B")
+        filled = 0
+        while filled < len(view):
+            n = stream.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        if filled < len(view):
+            break
+        count += 1
+        with lock:
+            latest["frame"] = frame
+            latest["count"] = count
+        frame_ready.set()
+    feed_ended.set()
+    frame_ready.set()
+
 def record_video_with_audio():
-    """Record video with audio using ffmpeg and show preview with pygame/opencv"""
+    """Record video with audio using ffmpeg and show its live preview with pygame"""
     timestamp = int(time.time())
     output_path = os.path.join(VIDEO_FOLDER, f"{timestamp}.mp4")
     
     print(f"Starting recording to: {output_path}")
     
-    # Improved ffmpeg command for better audio sync
+    # Improved ffmpeg command for better audio sync. The camera is opened
+    # only once, by ffmpeg: its video is split between the recording and a
+    # scaled-down raw BGR copy on stdout that drives the preview
     ffmpeg_cmd = [
         "ffmpeg", "-y",
         "-f", "avfoundation",
         "-framerate", "30",
         "-video_size", "1280x720",
+        "-t", str(RECORD_SECONDS),  # Input option, so it ends both outputs
         "-i", "0:1",  # Video device 0, audio device 1 (MacBook Pro Microphone)
-        "-t", str(RECORD_SECONDS),
-        "-c:v", "libx264",
-        "-preset", "fast",      # Better quality than ultrafast
-        "-crf", "23",           # Good quality setting
+        "-filter_complex",
+        f"[0:v]split=2[rec][prev];[prev]scale={PREVIEW_WIDTH}:{PREVIEW_HEIGHT},format=bgr24[prevout]",
+        "-map", "[rec]",
+        "-map", "0:a",
+        *video_encoder_args,
         "-c:a", "aac",
-        "-ar", "44100",         # Standard audio sample rate
+        "-ar", str(AUDIO_SAMPLE_RATE),  # Standard audio sample rate
         "-ac", "2",             # Stereo audio
         "-async", "1",          # Audio sync compensation
         "-vsync", "cfr",        # Constant frame rate for sync
         "-avoid_negative_ts", "make_zero",  # Handle timestamp issues
-        output_path
+        output_path,
+        "-map", "[prevout]",
+        "-f", "rawvideo",
+        "-pix_fmt", "bgr24",
+        "pipe:1"
     ]
     
     print("FFmpeg command:", " ".join(ffmpeg_cmd))
@@ -120,42 +392,52 @@ def record_video_with_audio():
         print(f"Failed to start ffmpeg: {e}")
         return
 
-    # Start preview using OpenCV
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("ERROR: Cannot open camera for preview")
-        process.terminate()
-        return
-    
-    start_time = time.time()
+    # Read the preview feed on a worker thread so the UI never blocks on it
+    latest = {"frame": None, "count": 0}
+    frame_lock = threading.Lock()
+    frame_ready = threading.Event()
+    feed_ended = threading.Event()
+    preview_thread = threading.Thread(target=read_preview_frames,
+                                      args=(process.stdout, latest, frame_lock, frame_ready, feed_ended),
+                                      daemon=True)
+    preview_thread.start()
+
+    start_time = time.monotonic()
     recording_stopped = False
+    last_drawn = None  # (preview frame count, remaining seconds) last shown
 
     while True:
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         if elapsed > RECORD_SECONDS:
             break
 
-        ret, frame = cap.read()
-        if not ret:
-            print("WARNING: Failed to read frame from camera")
+        if feed_ended.is_set():  # ffmpeg finished or failed
             break
 
-        # Convert and display frame
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame_rgb = cv2.resize(frame_rgb, (1280, 720))
-        surf = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-        screen.blit(surf, (0, 0))
-
-        # Show recording timer
         remaining = int(RECORD_SECONDS - elapsed)
-        timer_text = font.render(f"Recording... {remaining}s", True, (255, 0, 0))
-        screen.blit(timer_text, (20, 20))
-        
-        # Show recording indicator
-        record_indicator = font.render("● REC", True, (255, 0, 0))
-        screen.blit(record_indicator, (20, 60))
-        
-        pygame.display.flip()
+        with frame_lock:
+            frame_count = latest["count"]
+            # Only redraw when a new preview frame arrived or the timer changed
+            redraw = (frame_count, remaining) != last_drawn
+            if redraw:
+                # Draw under the lock: the reader reuses its frame buffers
+                if latest["frame"] is not None:
+                    blit_scaled_frame(latest["frame"])
+                else:
+                    screen.fill(BACKGROUND_COLOR)
+
+        if redraw:
+            last_drawn = (frame_count, remaining)
+
+            # Show recording timer
+            timer_text = render_text(f"Recording... {remaining}s", RECORDING_COLOR)
+            screen.blit(timer_text, (20, 20))
+            
+            # Show recording indicator
+            record_indicator = render_text(RECORDING_INDICATOR, RECORDING_COLOR)
+            screen.blit(record_indicator, (20, 60))
+            
+            pygame.display.flip()
 
         # Handle events
         for event in pygame.event.get():
@@ -170,11 +452,11 @@ def record_video_with_audio():
         if recording_stopped:
             break
 
-        clock.tick(30)
+        # Sleep until ffmpeg delivers a frame or the timer display is due
+        # to change, rather than polling at a fixed rate
+        frame_ready.wait(min(MAX_EVENT_WAIT, 1 - elapsed % 1))
+        frame_ready.clear()
 
-    # Clean up
-    cap.release()
-    
     # Stop ffmpeg process
     if process.poll() is None:  # Process is still running
         print("Stopping ffmpeg...")
@@ -185,13 +467,15 @@ def record_video_with_audio():
             print("Force killing ffmpeg...")
             process.kill()
             process.wait()
+
+    # The preview reader stops at EOF now that ffmpeg has exited
+    preview_thread.join()
     
-    # Check if recording was successful
-    stdout, stderr = process.communicate()
+    # Check if recording was successful (stdout carried the preview frames)
+    stderr = process.stderr.read()
     if process.returncode != 0:
         print(f"FFmpeg error (return code: {process.returncode}):")
-        print(f"STDOUT: {stdout.decode()}")
-        print(f"STDERR: {stderr.decode()}")
+        print(f"STDERR: {stderr.decode(errors='replace')}")
     else:
         print(f"Recording completed successfully: {output_path}")
         if os.path.exists(output_path):
@@ -200,118 +484,449 @@ def record_video_with_audio():
         else:
             print("WARNING: Output file was not created!")
 
+    if not is_video_file_valid(output_path):
+        return
+
+    # Extract the audio now, while the thank-you message shows, so playback
+    # never has to run ffmpeg for this recording
+    try:
+        audio_extractions[output_path] = start_audio_extraction(output_path)
+    except OSError as e:
+        print(f"Audio extraction error: {e}")
+
+    # Insert in name order, matching scan_recorded_videos(), so the playlist
+    # order is the same as after a restart without rescanning the folder.
+    # Record the new file in the signature too, or the next pass would
+    # see it as a change and rescan anyway.
+    bisect.insort(recorded_videos, output_path)
+    if recorded_videos_signature is not None:
+        stat = os.stat(output_path)
+        recorded_videos_signature[os.path.basename(output_path)] = (stat.st_size, stat.st_mtime_ns)
+
+def is_video_file_valid(path, file_size=None):
+    """Check an MP4's top-level atoms: it needs moov and mdat and no truncation"""
+    atoms = set()
+    try:
+        with open(path, "rb") as f:
+            if file_size is None:
+                file_size = os.fstat(f.fileno()).st_size
+            offset = 0
+            while offset < file_size:
+                f.seek(offset)
+                header = f.read(16)
+                if len(header) < 8:
+                    return False
+                atom_size, atom_type = struct.unpack(">I4s", header[:8])
+                if atom_size == 1:  # 64-bit extended size
+                    if len(header) < 16:
+                        return False
+                    atom_size = struct.unpack(">Q", header[8:])[0]
+                elif atom_size == 0:  # Atom runs to end of file
+                    atom_size = file_size - offset
+                if atom_size < 8 or offset + atom_size > file_size:
+                    return False
+                atoms.add(atom_type)
+                offset += atom_size
+    except OSError:
+        return False
+    return b"moov" in atoms and b"mdat" in atoms
+
+def scan_recorded_videos():
+    """Return the sorted paths of all playable recordings"""
+    # scandir entries carry their path and cache their stat, saving syscalls
+    entries = []
+    with os.scandir(VIDEO_FOLDER) as it:
+        for entry in it:
+            if entry.name.endswith(".mp4"):
+                size = entry.stat().st_size
+                if size >= MIN_VIDEO_FILE_SIZE:
+                    entries.append((entry.name, entry.path, size))
+    entries.sort()
+    paths = [path for _, path, _ in entries]
+    sizes = [size for _, _, size in entries]
+    # Validation is I/O bound and independent per file, so check them in parallel
+    valid = list(scan_pool.map(is_video_file_valid, paths, sizes))
+    return [path for path, ok in zip(paths, valid) if ok]
+
+def recordings_signature():
+    """Return the size and mtime of every .mp4 in the recordings folder"""
+    signature = {}
+    with os.scandir(VIDEO_FOLDER) as it:
+        for entry in it:
+            if entry.name.endswith(".mp4"):
+                stat = entry.stat()
+                signature[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return signature
+
+def refresh_recorded_videos():
+    """Rescan the recordings folder if its recordings changed since the last scan
+
+    Comparing each file's size and mtime, rather than only the folder's,
+    also catches a file that was still being copied in at the last scan.
+    Anything held for videos that are no longer listed is released.
+    """
+    global recorded_videos_signature
+    signature = recordings_signature()
+    if signature == recorded_videos_signature:
+        return
+    recorded_videos_signature = signature
+    recorded_videos[:] = scan_recorded_videos()
+    listed = set(recorded_videos)
+    held = (*capture_cache, *pending_captures, *audio_tracks, *audio_extractions)
+    for path in {p for p in held if p not in listed}:
+        forget_video(path)
+
+def forget_video(path):
+    """Drop a video from the playlist and release anything held for it
+
+    Its capture is released, a running audio extraction is stopped and
+    its cached WAV is deleted.
+    """
+    if path in recorded_videos:
+        recorded_videos.remove(path)
+    cap = capture_cache.pop(path, None)
+    if cap is not None:
+        cap.release()
+    future = pending_captures.pop(path, None)
+    if future is not None:
+        future.result().release()
+    video_fps_cache.pop(path, None)
+
+    process = audio_extractions.pop(path, None)
+    if process is not None:
+        process.kill()
+        process.wait()
+    future = audio_tracks.pop(path, None)
+    if future is not None and not future.cancel():
+        # Still extracting on the audio pool; clean up once it finishes
+        future.add_done_callback(lambda _: remove_cached_audio(path))
+    else:
+        remove_cached_audio(path)
+
+def audio_cache_path(video_path):
+    """Return where a video's extracted WAV is cached, keyed by its path
+
+    WAVs live outside VIDEO_FOLDER so the recordings folder only holds
+    recordings.
+    """
+    key = hashlib.sha1(os.path.abspath(video_path).encode()).hexdigest()
+    return os.path.join(AUDIO_CACHE_DIR, key + ".wav")
+
+def remove_cached_audio(video_path):
+    """Delete a video's cached WAV and any partial extraction"""
+    audio_path = audio_cache_path(video_path)
+    for path in (audio_path, audio_path + ".part"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def start_audio_extraction(video_path):
+    """Start extracting a video's audio to a partial WAV in the background"""
+    # Extract audio to WAV for better pygame compatibility; write to a
+    # temporary name so a failed extraction never leaves a partial WAV
+    partial_path = audio_cache_path(video_path) + ".part"
+    return subprocess.Popen([
+        "ffmpeg", "-y", "-i", video_path, 
+        "-vn", "-acodec", "pcm_s16le", "-ar", str(AUDIO_SAMPLE_RATE), "-ac", "2",
+        "-f", "wav", partial_path
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def get_audio_track(video_path):
+    """Return a WAV of the video's audio, or None if it has none
+
+    New recordings have their audio extraction started as soon as they
+    finish; older files are extracted here. Blocks until ffmpeg is done, so
+    call it through request_audio_track().
+    """
+    audio_path = audio_cache_path(video_path)
+    if not os.path.exists(audio_path):
+        partial_path = audio_path + ".part"
+        try:
+            process = audio_extractions.pop(video_path, None)
+            if process is None:
+                process = start_audio_extraction(video_path)
+            if process.wait() != 0:
+                print(f"Audio extraction failed for: {video_path}")
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                return None
+            os.replace(partial_path, audio_path)
+        except OSError as e:
+            # e.g. ffmpeg missing; play the video silently rather than stop
+            print(f"Audio extraction error: {e}")
+            return None
+    return audio_path
+
+def request_audio_track(video_path):
+    """Return a Future of the video's WAV path, resolved on the audio pool
+
+    The Future is kept, so each video's audio (or lack of it) is looked up
+    only once, and playback never blocks waiting for ffmpeg.
+    """
+    future = audio_tracks.get(video_path)
+    if future is None:
+        future = audio_tracks[video_path] = audio_pool.submit(get_audio_track, video_path)
+    return future
+
+def start_audio(audio_path, offset):
+    """Play a WAV starting offset seconds in, to line up with the video"""
+    try:
+        pygame.mixer.music.load(audio_path)
+        pygame.mixer.music.play(start=offset)
+    except pygame.error as e:
+        print(f"Audio playback error: {e}")
+
+def open_playback_capture(path):
+    """Open a video with the FFmpeg backend, using hardware decoding if available"""
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):  # OpenCV 4.5.2+
+        return cv2.VideoCapture(path, cv2.CAP_FFMPEG,
+                                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    return cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+
+def get_playback_capture(path):
+    """Return an open capture for a video, reusing a cached or prefetched one"""
+    if path in capture_cache:
+        cap = capture_cache.pop(path)
+    elif path in pending_captures:
+        cap = pending_captures.pop(path).result()
+    else:
+        cap = open_playback_capture(path)
+    if not cap.isOpened():
+        cap.release()
+        return None
+    return cap
+
+def prefetch_playback_capture(path):
+    """Start opening a video's capture in the background"""
+    if path not in capture_cache and path not in pending_captures:
+        pending_captures[path] = capture_opener.submit(open_playback_capture, path)
+
+def recycle_playback_capture(path, cap):
+    """Rewind a capture and keep it open for reuse, evicting the oldest"""
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    capture_cache[path] = cap
+    while len(capture_cache) > CAPTURE_CACHE_SIZE:
+        _, old_cap = capture_cache.popitem(last=False)
+        old_cap.release()
+
+def release_playback_captures():
+    """Release every cached and prefetched capture"""
+    for cap in capture_cache.values():
+        cap.release()
+    capture_cache.clear()
+    for future in pending_captures.values():
+        future.result().release()
+    pending_captures.clear()
+
+def decode_video_frames(cap, fps, start_time, frame_queue, stop_event):
+    """Decode a video on a worker thread, queueing (frame index, frame) pairs
+
+    The bounded queue keeps decoding a few frames ahead of display. None is
+    queued once the video ends.
+    """
+    def put(item):
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    # Decode into a ring of reused buffers. It holds one more frame than the
+    # queue plus the one on screen, so a buffer is only rewritten once the
+    # UI thread has moved past it.
+    buffers = [None] * (DECODE_QUEUE_SIZE + 2)
+    reads = 0
+
+    # Position is tracked in frame_index rather than queried from the
+    # capture; a failed read() is what ends playback
+    frame_index = 0
+    while not stop_event.is_set():
+        # Catch up on late frames with grab(), which skips decoding
+        behind = int((time.monotonic() - start_time) * fps) - frame_index
+        if behind > MAX_CATCHUP_FRAMES:
+            frame_index += behind
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        else:
+            for _ in range(behind):
+                if not cap.grab():
+                    break
+                frame_index += 1
+
+        slot = reads % len(buffers)
+        ret, frame = cap.read(buffers[slot])
+        if not ret:
+            break
+        buffers[slot] = frame
+        reads += 1
+        put((frame_index, frame))
+        frame_index += 1
+    put(None)
+
 def play_idle_loop():
     """Play recorded videos in a loop during idle state"""
+    waiting_shown = False
     while True:
-        video_files = sorted([f for f in os.listdir(VIDEO_FOLDER) if f.endswith(".mp4")])
+        # Pick up recordings added, changed or deleted by hand since the last
+        # pass (the waiting screen does this on its own timer)
+        if not waiting_shown:
+            refresh_recorded_videos()
+        video_files = list(recorded_videos)
         
         if not video_files:
-            # No videos available - show waiting message
-            screen.fill(BACKGROUND_COLOR)
-            text = font.render("Press SPACE to record your story about home", True, FONT_COLOR)
-            rect = text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-            screen.blit(text, rect)
-            pygame.display.flip()
+            # No videos available - show waiting message, drawn only once
+            # since nothing on this screen changes
+            if not waiting_shown:
+                screen.fill(BACKGROUND_COLOR)
+                text = render_text(IDLE_MESSAGE)
+                rect = text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+                screen.blit(text, rect)
+                pygame.display.flip()
+                waiting_shown = True
+                next_scan = time.monotonic() + IDLE_RESCAN_MS / 1000
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return True
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                    return False
-            clock.tick(30)
+            # Nothing to redraw, so block on input instead of ticking at 30 FPS.
+            # Rescan every IDLE_RESCAN_MS in case recordings were copied in by
+            # hand; other events (mouse motion etc.) must not trigger a scan.
+            event = pygame.event.wait(max(1, math.ceil((next_scan - time.monotonic()) * 1000)))
+            if event.type == pygame.QUIT:
+                return True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                return False
+            if time.monotonic() >= next_scan:
+                refresh_recorded_videos()
+                next_scan = time.monotonic() + IDLE_RESCAN_MS / 1000
             continue
 
+        waiting_shown = False
+
         # Play each video file
-        for video_file in video_files:
-            filepath = os.path.join(VIDEO_FOLDER, video_file)
+        for i, filepath in enumerate(video_files):
             print(f"Playing: {filepath}")
             
-            cap = cv2.VideoCapture(filepath)
-            if not cap.isOpened():
+            cap = get_playback_capture(filepath)
+            if cap is None:
+                # Deleted or unreadable; drop it so the playlist cannot spin on it
                 print(f"Could not open video: {filepath}")
+                forget_video(filepath)
                 continue
 
+            # Open the next video while this one plays
+            next_filepath = video_files[(i + 1) % len(video_files)]
+            if next_filepath != filepath:
+                prefetch_playback_capture(next_filepath)
+                request_audio_track(next_filepath)
+
             # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            if fps <= 0:
-                fps = 30  # Default fallback
+            fps = video_fps_cache.get(filepath)
+            if fps is None:
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                if fps <= 0:
+                    fps = 30  # Default fallback
+                video_fps_cache[filepath] = fps
             frame_delay = 1.0 / fps
 
-            # Extract and play audio
-            audio_thread = None
-            try:
-                # Extract audio to WAV for better pygame compatibility
-                subprocess.run([
-                    "ffmpeg", "-y", "-i", filepath, 
-                    "-vn", "-acodec", "pcm_s16le", "-ar", "44100", "-ac", "2",
-                    TEMP_AUDIO_PLAYBACK
-                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-
-                if os.path.exists(TEMP_AUDIO_PLAYBACK):
-                    pygame.mixer.music.load(TEMP_AUDIO_PLAYBACK)
-                    pygame.mixer.music.play()
-            except Exception as e:
-                print(f"Audio extraction/playback error: {e}")
-
-            # Play video frames
-            last_frame_time = time.time()
-            
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
+            # Audio starts once its WAV is ready; video does not wait for it
+            audio_track = request_audio_track(filepath)
+            audio_started = False
+
+            # Play video frames, decoded ahead on a worker thread
+            start_time = time.monotonic()
+            frame_queue = queue.Queue(maxsize=DECODE_QUEUE_SIZE)
+            stop_decode = threading.Event()
+            decode_thread = threading.Thread(target=decode_video_frames,
+                                             args=(cap, fps, start_time, frame_queue, stop_decode),
+                                             daemon=True)
+            decode_thread.start()
+            quit_result = None
+            stalled = False
+
+            while quit_result is None:
+                try:
+                    item = frame_queue.get(timeout=DECODE_TIMEOUT)
+                except queue.Empty:
+                    print(f"Decoding stalled: {filepath}")
+                    stalled = True
+                    break
+                if item is None:
                     break
+                frame_index, frame = item
 
-                # Frame timing
-                current_time = time.time()
-                if current_time - last_frame_time < frame_delay:
-                    time.sleep(frame_delay - (current_time - last_frame_time))
-                last_frame_time = time.time()
+                # Frame timing; drop a late frame if a newer one is waiting
+                delay = start_time + frame_index * frame_delay - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -frame_delay and not frame_queue.empty():
+                    continue
 
                 # Display frame
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frame_rgb = cv2.resize(frame_rgb, (WINDOW_WIDTH, WINDOW_HEIGHT))
-                surf = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-                screen.blit(surf, (0, 0))
+                screen.blit(frame_to_surface(frame), (0, 0))
                 
                 # Show playback indicator
-                play_text = font.render("Playing recordings - Press SPACE to record new", True, (255, 255, 255))
+                play_text = render_text(PLAYBACK_HINT)
                 screen.blit(play_text, (20, WINDOW_HEIGHT - 40))
                 
                 pygame.display.flip()
 
+                # Play audio, offset to where the video has got to
+                if not audio_started and audio_track.done():
+                    audio_started = True
+                    if audio_track.result():
+                        start_audio(audio_track.result(), time.monotonic() - start_time)
+
                 # Handle events
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
-                        cap.release()
-                        pygame.mixer.music.stop()
-                        if os.path.exists(TEMP_AUDIO_PLAYBACK):
-                            os.remove(TEMP_AUDIO_PLAYBACK)
-                        return True
+                        quit_result = True
+                        break
                     elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                        cap.release()
-                        pygame.mixer.music.stop()
-                        if os.path.exists(TEMP_AUDIO_PLAYBACK):
-                            os.remove(TEMP_AUDIO_PLAYBACK)
-                        return False
+                        quit_result = False
+                        break
 
-            cap.release()
+            # The worker must be done with the capture before it is reused
+            stop_decode.set()
+            if stalled:
+                # The worker may be hung inside read(), so don't wait on it
+                # for long. Never reuse the capture, and only release it once
+                # the worker has let go of it.
+                decode_thread.join(timeout=STALL_JOIN_TIMEOUT)
+                if not decode_thread.is_alive():
+                    cap.release()
+                forget_video(filepath)
+            else:
+                decode_thread.join()
+                recycle_playback_capture(filepath, cap)
             pygame.mixer.music.stop()
-            
-            # Clean up audio file
-            if os.path.exists(TEMP_AUDIO_PLAYBACK):
-                os.remove(TEMP_AUDIO_PLAYBACK)
+            if quit_result is not None:
+                return quit_result
 
 # Main execution
 def main():
+    parser = argparse.ArgumentParser(description="Home Installation")
+    parser.add_argument("--reprobe", action="store_true",
+                        help="ignore cached ffmpeg/device probe results")
+    args = parser.parse_args()
+
     print("=== Home Installation Starting ===")
     
     # Test system capabilities
-    if not test_camera_and_audio():
+    if not test_camera_and_audio(reprobe=args.reprobe):
         print("System test failed. Please check camera and ffmpeg installation.")
         pygame.quit()
         return
     
     print("System test passed. Starting main loop...")
+
+    # Scan the recordings folder; after this only changes to it trigger a rescan
+    refresh_recorded_videos()
+
+    # Rasterize the fixed UI strings up front so no frame pays for it
+    for message in (PROMPT_MESSAGE, THANK_YOU_MESSAGE, IDLE_MESSAGE, PLAYBACK_HINT):
+        render_text(message)
+    render_text(RECORDING_INDICATOR, RECORDING_COLOR)
+    if not pygame_reads_bgr:
+        prepare_bgr_fallback()
     
     running = True
     while running:
@@ -320,16 +935,19 @@ def main():
             break
         
         # Preparation phase
-        if display_message("What does home mean to you?", PREP_SECONDS, countdown=True):
+        if display_message(PROMPT_MESSAGE, PREP_SECONDS, countdown=True):
             break
         
         # Recording phase
         record_video_with_audio()
         
         # Thank you message
-        if display_message("Thank you for sharing your story!", 3):
+        if display_message(THANK_YOU_MESSAGE, 3):
             break
 
+    release_playback_captures()
+    for pool in (scan_pool, capture_opener, audio_pool):
+        pool.shutdown(wait=False, cancel_futures=True)
     pygame.quit()
     print("=== Installation Ended ===")
 